@@ -0,0 +1,214 @@
+"""
+Acesso ao MinIO (bucket inmet-raw) com inicialização preguiçosa.
+
+O cliente só é criado (e o pacote minio só é importado) no primeiro uso.
+A verificação/criação do bucket roda em segundo plano, com novas tentativas,
+a partir do lifespan da API: enquanto o MinIO não responde a API sobe em
+modo degradado e os endpoints de armazenamento respondem 503.
+
+Os CSVs são gravados comprimidos em gzip (`.csv.gz`, Content-Encoding: gzip)
+e `ler` devolve sempre o conteúdo descomprimido.
+"""
+
+import asyncio
+import gzip
+import io
+import os
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+
+# ============================
+# CONFIGURAÇÃO DO MINIO
+# ============================
+# Se estiver em docker-compose, normalmente o serviço é "minio:9000"
+MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "minio:9000")
+MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "admin")
+MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "admin12345")
+MINIO_USE_SSL = False
+RAW_BUCKET = "inmet-raw"
+
+# Falha rápido: quem insiste é o laço de inicialização, não cada requisição
+TIMEOUT_CONEXAO_S = 2
+TIMEOUT_LEITURA_S = 30
+INTERVALO_MAX_RETRY_S = 30
+
+# Compressão dos objetos (gzip é da stdlib e lido por qualquer ferramenta)
+EXTENSAO_GZIP = ".gz"
+NIVEL_GZIP = 6
+_MAGIC_GZIP = b"\x1f\x8b"
+
+
+class ArmazenamentoIndisponivel(Exception):
+    """O MinIO ainda não respondeu (ou o bucket ainda não foi verificado)."""
+
+
+class ErroArmazenamento(Exception):
+    """Erro devolvido pelo MinIO em uma operação."""
+
+    def __init__(self, mensagem: str, code: str = None):
+        super().__init__(mensagem)
+        self.code = code
+
+
+def comprimir(dados: bytes) -> bytes:
+    # mtime=0: o mesmo conteúdo gera sempre os mesmos bytes (ETag estável)
+    return gzip.compress(dados, compresslevel=NIVEL_GZIP, mtime=0)
+
+
+def descomprimir(dados: bytes) -> bytes:
+    """
+    Descomprime se for gzip. O urllib3 pode já ter decodificado a resposta
+    (Content-Encoding: gzip), por isso a decisão é pelos bytes mágicos.
+    """
+    if dados[:2] == _MAGIC_GZIP:
+        return gzip.decompress(dados)
+    return dados
+
+
+class Armazenamento:
+    def __init__(self, endpoint: str, access_key: str, secret_key: str, secure: bool, bucket: str):
+        self.endpoint = endpoint
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.secure = secure
+        self.bucket = bucket
+
+        self._cliente = None
+        self._lock = threading.Lock()
+
+        self.pronto = False
+        self.ultimo_erro = None
+        self.tentativas = 0
+
+    @property
+    def cliente(self):
+        if self._cliente is None:
+            with self._lock:
+                if self._cliente is None:
+                    import urllib3
+                    from minio import Minio
+
+                    http_client = urllib3.PoolManager(
+                        timeout=urllib3.Timeout(connect=TIMEOUT_CONEXAO_S, read=TIMEOUT_LEITURA_S),
+                        maxsize=16,
+                        retries=urllib3.Retry(
+                            total=2,
+                            backoff_factor=0.2,
+                            status_forcelist=[500, 502, 503, 504],
+                        ),
+                    )
+                    self._cliente = Minio(
+                        self.endpoint,
+                        access_key=self.access_key,
+                        secret_key=self.secret_key,
+                        secure=self.secure,
+                        http_client=http_client,
+                    )
+        return self._cliente
+
+    # ============================
+    # INICIALIZAÇÃO
+    # ============================
+
+    def inicializar(self):
+        """Garante que o bucket existe (chamada bloqueante)."""
+        if not self.cliente.bucket_exists(self.bucket):
+            self.cliente.make_bucket(self.bucket)
+        self.pronto = True
+        self.ultimo_erro = None
+
+    async def inicializar_com_retry(self):
+        """Tenta inicializar até conseguir, com backoff exponencial."""
+        while not self.pronto:
+            try:
+                await run_in_threadpool(self.inicializar)
+            except Exception as e:
+                self.tentativas += 1
+                self.ultimo_erro = f"{type(e).__name__}: {e}"
+                await asyncio.sleep(min(INTERVALO_MAX_RETRY_S, 0.5 * 2 ** self.tentativas))
+
+    def status(self) -> dict:
+        return {
+            "pronto": self.pronto,
+            "endpoint": self.endpoint,
+            "bucket": self.bucket,
+            "tentativas": self.tentativas,
+            "erro": self.ultimo_erro,
+        }
+
+    def _exigir_pronto(self):
+        if not self.pronto:
+            raise ArmazenamentoIndisponivel(
+                f"MinIO indisponível ({self.endpoint}): {self.ultimo_erro or 'inicializando'}"
+            )
+
+    # ============================
+    # OPERAÇÕES
+    # ============================
+
+    def ler(self, object_name: str) -> bytes:
+        """Conteúdo (descomprimido) do objeto, ou None se ele não existe."""
+        from minio.error import S3Error
+
+        self._exigir_pronto()
+        try:
+            resposta = self.cliente.get_object(self.bucket, object_name)
+            try:
+                return descomprimir(resposta.read())
+            finally:
+                resposta.close()
+                resposta.release_conn()
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                return None
+            raise ErroArmazenamento(str(e), e.code) from e
+
+    def gravar(self, object_name: str, dados: bytes, content_type: str, comprimido: bool = False):
+        """
+        Grava o objeto. Com `comprimido=True`, os dados são comprimidos em
+        gzip e o objeto recebe Content-Encoding: gzip (use nomes .gz).
+        Retorna o tamanho gravado em bytes.
+        """
+        from minio.error import S3Error
+
+        self._exigir_pronto()
+        metadata = None
+        if comprimido:
+            dados = comprimir(dados)
+            metadata = {"Content-Encoding": "gzip"}
+        try:
+            self.cliente.put_object(
+                self.bucket,
+                object_name,
+                io.BytesIO(dados),
+                length=len(dados),
+                content_type=content_type,
+                metadata=metadata,
+            )
+        except S3Error as e:
+            raise ErroArmazenamento(str(e), e.code) from e
+        return len(dados)
+
+    def remover(self, object_name: str):
+        from minio.error import S3Error
+
+        self._exigir_pronto()
+        try:
+            self.cliente.remove_object(self.bucket, object_name)
+        except S3Error as e:
+            raise ErroArmazenamento(str(e), e.code) from e
+
+    def listar(self, prefix: str = "") -> list:
+        from minio.error import S3Error
+
+        self._exigir_pronto()
+        try:
+            return list(self.cliente.list_objects(self.bucket, prefix=prefix, recursive=True))
+        except S3Error as e:
+            raise ErroArmazenamento(str(e), e.code) from e
+
+
+armazenamento = Armazenamento(
+    MINIO_ENDPOINT, MINIO_ACCESS_KEY, MINIO_SECRET_KEY, MINIO_USE_SSL, RAW_BUCKET
+)
@@ -0,0 +1,104 @@
+"""
+Deduplicação na ingestão por (device, ts).
+
+Cada CSV mensal tem um índice compacto com os timestamps já gravados: um
+array('q') ordenado de epoch em microssegundos (8 bytes por leitura, ~6 KB
+para um mês de leituras horárias). A busca é binária; o índice é montado a
+partir do próprio CSV na primeira vez que o objeto é tocado e depois só
+recebe inserções.
+
+Só o worker dono do device escreve no objeto (ver sharding.py), então o
+índice em memória dele é a fonte da verdade enquanto o processo vive.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+import threading
+
+# Objetos mensais com índice em memória (os mais antigos saem primeiro)
+MAX_INDICES = 1024
+
+
+def chave_ts(ts_str: str):
+    """
+    Timestamp ISO da 1ª coluna do CSV → epoch em microssegundos (UTC).
+    Retorna None se não for possível interpretar.
+    """
+    try:
+        ts = datetime.fromisoformat(ts_str.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    delta = ts - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+class IndiceTimestamps:
+    """Conjunto ordenado de timestamps (int64) de um objeto mensal."""
+
+    def __init__(self, chaves=()):
+        self._chaves = array("q", sorted(set(chaves)))
+
+    @classmethod
+    def do_csv(cls, conteudo: bytes) -> "IndiceTimestamps":
+        """Monta o índice a partir do CSV (1ª linha é o cabeçalho)."""
+        chaves = []
+        for linha in conteudo.decode("utf-8").splitlines()[1:]:
+            chave = chave_ts(linha.split(",", 1)[0])
+            if chave is not None:
+                chaves.append(chave)
+        return cls(chaves)
+
+    def __len__(self) -> int:
+        return len(self._chaves)
+
+    def __contains__(self, chave: int) -> bool:
+        i = bisect_left(self._chaves, chave)
+        return i < len(self._chaves) and self._chaves[i] == chave
+
+    def adicionar(self, chave: int) -> bool:
+        """Inclui a chave; retorna False se ela já existia."""
+        i = bisect_left(self._chaves, chave)
+        if i < len(self._chaves) and self._chaves[i] == chave:
+            return False
+        # Leituras chegam quase sempre em ordem: o insert cai no fim
+        self._chaves.insert(i, chave)
+        return True
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return self._chaves.itemsize * len(self._chaves)
+
+
+class IndicesMensais:
+    """Índices por objeto mensal, com limite de objetos em memória (LRU)."""
+
+    def __init__(self, max_indices: int = MAX_INDICES):
+        self.max_indices = max_indices
+        self._indices = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, object_name: str) -> IndiceTimestamps:
+        with self._lock:
+            indice = self._indices.get(object_name)
+            if indice is not None:
+                self._indices.move_to_end(object_name)
+            return indice
+
+    def set(self, object_name: str, indice: IndiceTimestamps):
+        with self._lock:
+            self._indices[object_name] = indice
+            self._indices.move_to_end(object_name)
+            while len(self._indices) > self.max_indices:
+                self._indices.popitem(last=False)
+
+    def resumo(self) -> dict:
+        with self._lock:
+            return {
+                "objetos": len(self._indices),
+                "timestamps": sum(len(i) for i in self._indices.values()),
+                "bytes": sum(i.tamanho_bytes for i in self._indices.values()),
+            }
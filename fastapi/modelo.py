@@ -0,0 +1,195 @@
+"""
+Avaliador compacto dos modelos climáticos (somente NumPy).
+
+Carrega o artefato gerado por `scripts/exportar_modelo.py`:
+
+    <destino>/manifest.json   -> ordem das features, versão do sklearn, modelos
+    <destino>/arrays.npz      -> scaler, centróides do K-means e nós das árvores
+
+e reproduz as previsões do scikit-learn sem importá-lo nem usar pickle.
+"""
+
+from pathlib import Path
+import json
+
+import numpy as np
+
+FORMATO = "clima-modelo"
+VERSAO_FORMATO = 1
+
+MANIFEST_NAME = "manifest.json"
+ARRAYS_NAME = "arrays.npz"
+
+# Marcador de folha usado pelo sklearn em children_left/children_right
+FOLHA = -1
+
+
+class Ensemble:
+    """
+    Uma árvore (ou floresta) serializada em arrays planos.
+
+    Os nós de todas as árvores ficam concatenados; `raizes` guarda o índice do
+    nó raiz de cada árvore e os filhos já apontam para índices absolutos.
+    """
+
+    def __init__(self, nome: str, meta: dict, arrays: dict):
+        self.nome = nome
+        self.tipo = meta["tipo"]              # "classifier" | "regressor"
+        self.estimador = meta["estimador"]    # ex: "DecisionTreeClassifier"
+        self.variaveis = list(meta["variaveis"])
+        self.classes = np.asarray(meta["classes"]) if meta.get("classes") is not None else None
+
+        self.raizes = arrays[f"{nome}/raizes"]
+        self.feature = arrays[f"{nome}/feature"]
+        self.threshold = arrays[f"{nome}/threshold"]
+        self.left = arrays[f"{nome}/left"]
+        self.right = arrays[f"{nome}/right"]
+        self.value = arrays[f"{nome}/value"]
+
+    @property
+    def floresta(self) -> bool:
+        return self.estimador.startswith("RandomForest")
+
+    def _folhas(self, X: np.ndarray) -> np.ndarray:
+        """
+        Percorre todas as árvores em paralelo, nível a nível.
+        Retorna um array (n_arvores, n_amostras) com o índice da folha.
+        """
+        # Mesma regra do sklearn: X em float32 comparado com threshold em float64
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        n = X32.shape[0]
+
+        nos = np.repeat(self.raizes[:, None], n, axis=1)
+        amostras = np.broadcast_to(np.arange(n), nos.shape)
+
+        while True:
+            esquerda = self.left[nos]
+            ativos = esquerda != FOLHA
+            if not ativos.any():
+                return nos
+
+            nos_ativos = nos[ativos]
+            valores = X32[amostras[ativos], self.feature[nos_ativos]]
+            vai_esquerda = valores <= self.threshold[nos_ativos]
+            nos[ativos] = np.where(vai_esquerda, esquerda[ativos], self.right[nos_ativos])
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probabilidades por classe (média entre as árvores, como no sklearn)."""
+        folhas = self._folhas(X)
+        soma = np.zeros((folhas.shape[1], self.value.shape[1]), dtype=np.float64)
+
+        # Soma sequencial árvore a árvore para preservar a ordem de arredondamento
+        for folhas_arvore in folhas:
+            proba = self.value[folhas_arvore]
+            normalizador = proba.sum(axis=1)[:, None]
+            normalizador[normalizador == 0.0] = 1.0
+            soma += proba / normalizador
+
+        soma /= folhas.shape[0]
+        return soma
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.tipo == "classifier":
+            if self.floresta:
+                proba = self.predict_proba(X)
+            else:
+                # DecisionTreeClassifier.predict usa o argmax dos valores brutos
+                proba = self.value[self._folhas(X)[0]]
+            return self.classes.take(np.argmax(proba, axis=1), axis=0)
+
+        folhas = self._folhas(X)
+        saida = np.zeros(folhas.shape[1], dtype=np.float64)
+        for folhas_arvore in folhas:
+            saida += self.value[folhas_arvore, 0]
+        if self.floresta:
+            saida /= folhas.shape[0]
+        return saida
+
+
+class ModeloClima:
+    """
+    StandardScaler + K-means + modelos de árvore, carregados de um artefato
+    compacto (manifest JSON + arrays .npz).
+    """
+
+    def __init__(self, manifest: dict, arrays: dict):
+        if manifest.get("formato") != FORMATO:
+            raise ValueError("Artefato não é um modelo climático compacto.")
+        if manifest.get("versao_formato") != VERSAO_FORMATO:
+            raise ValueError(
+                f"Versão de formato não suportada: {manifest.get('versao_formato')}"
+            )
+
+        self.manifest = manifest
+        self.variaveis = list(manifest["variaveis"])
+        self.sklearn_version = manifest.get("sklearn_version")
+        # {device: {variavel: [inferior, superior]}} do filtro IQR do treino
+        self.limites_outliers = manifest.get("limites_outliers", {})
+
+        self.scaler_mean = arrays["scaler/mean"]
+        self.scaler_scale = arrays["scaler/scale"]
+        self.centros = arrays["kmeans/centros"]
+        self._centros_sq = np.einsum("ij,ij->i", self.centros, self.centros)
+
+        self.modelos = {
+            nome: Ensemble(nome, meta, arrays)
+            for nome, meta in manifest.get("modelos", {}).items()
+        }
+
+    @classmethod
+    def carregar(cls, diretorio) -> "ModeloClima":
+        diretorio = Path(diretorio)
+        manifest = json.loads((diretorio / MANIFEST_NAME).read_text(encoding="utf-8"))
+        with np.load(diretorio / ARRAYS_NAME, allow_pickle=False) as npz:
+            arrays = {chave: npz[chave] for chave in npz.files}
+        return cls(manifest, arrays)
+
+    # ============================
+    # PRÉ-PROCESSAMENTO
+    # ============================
+
+    def matriz(self, linhas, variaveis=None) -> np.ndarray:
+        """
+        Monta a matriz de entrada na ordem de features do manifest.
+        Aceita lista de dicts ou array 2D já ordenado.
+        """
+        variaveis = self.variaveis if variaveis is None else variaveis
+
+        if isinstance(linhas, np.ndarray):
+            X = np.asarray(linhas, dtype=np.float64)
+        else:
+            X = np.array(
+                [[float(linha[v]) for v in variaveis] for linha in linhas],
+                dtype=np.float64,
+            )
+
+        if X.ndim != 2 or X.shape[1] != len(variaveis):
+            raise ValueError(f"Esperado matriz (n, {len(variaveis)}) com {variaveis}")
+        if np.isnan(X).any():
+            raise ValueError("Entrada contém NaN; preencha os valores antes de prever.")
+        return X
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Equivalente a StandardScaler.transform."""
+        return (X - self.scaler_mean) / self.scaler_scale
+
+    # ============================
+    # PREVISÃO
+    # ============================
+
+    def predict_cluster(self, X: np.ndarray) -> np.ndarray:
+        """
+        Equivalente a KMeans.predict(scaler.transform(X)).
+        Usa a mesma forma do sklearn: ||c||² - 2·x·c (||x||² não altera o argmin).
+        """
+        Xs = self.transform(X)
+        distancias = self._centros_sq - 2.0 * (Xs @ self.centros.T)
+        return np.argmin(distancias, axis=1).astype(np.int32)
+
+    def predict(self, nome: str, X: np.ndarray) -> np.ndarray:
+        """Previsão do modelo de árvore `nome` (features em bruto, sem scaler)."""
+        try:
+            modelo = self.modelos[nome]
+        except KeyError:
+            raise KeyError(f"Modelo '{nome}' não existe no artefato.") from None
+        return modelo.predict(X)
@@ -0,0 +1,172 @@
+"""
+Séries temporais reduzidas para gráficos.
+
+- Pirâmide de resolução (hora/dia/semana) pré-calculada no PostgreSQL como
+  views materializadas (scripts/build_series_pyramids.py).
+- Redução para a largura do gráfico em pixels com LTTB ou min/max por balde.
+- Cache LRU das respostas, com ETag.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+import numpy as np
+
+# Variáveis disponíveis e agregação usada na pirâmide
+# (a mesma do dashboard do ThingsBoard: média, soma para precipitação)
+VARIAVEIS = {
+    "temp_ar": "AVG",
+    "umidade": "AVG",
+    "radiacao": "AVG",
+    "vento_vel": "AVG",
+    "precipitacao": "SUM",
+    "pressao": "AVG",
+}
+
+# (nome, view, tamanho do balde em segundos), da mais fina para a mais grossa
+NIVEIS = [
+    ("hora", "inmet_serie_hora", 3600),
+    ("dia", "inmet_serie_dia", 86400),
+    ("semana", "inmet_serie_semana", 7 * 86400),
+]
+
+METODOS = ("lttb", "minmax")
+
+
+# ============================
+# PIRÂMIDE
+# ============================
+
+def escolher_nivel(inicio_ms: int, fim_ms: int, largura: int) -> tuple:
+    """
+    Nível mais grosso que ainda tem pelo menos um ponto por pixel.
+    Ex.: 1 ano em 300 px -> "dia" (365 pontos); 1 semana -> "hora".
+    """
+    segundos_por_pixel = (fim_ms - inicio_ms) / 1000 / max(largura, 1)
+    escolhido = NIVEIS[0]
+    for nivel in NIVEIS:
+        if nivel[2] <= segundos_por_pixel:
+            escolhido = nivel
+    return escolhido
+
+
+def consulta_serie(view: str, variavel: str) -> str:
+    """SQL da série de um device; `variavel` precisa estar em VARIAVEIS."""
+    if variavel not in VARIAVEIS:
+        raise ValueError(f"Variável inválida: {variavel}")
+    return (
+        f"SELECT ts, {variavel} AS valor FROM {view} "
+        "WHERE device_name = :device AND ts >= :inicio AND ts < :fim "
+        "ORDER BY ts"
+    )
+
+
+# ============================
+# REDUÇÃO
+# ============================
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> tuple:
+    """
+    Largest-Triangle-Three-Buckets: escolhe `n` pontos preservando a forma
+    visual da série. Mantém sempre o primeiro e o último ponto.
+    """
+    total = len(x)
+    if n >= total:
+        return x, y
+    if n < 3:
+        # Sem baldes intermediários: só as pontas
+        pontas = [0, total - 1][:n]
+        return x[pontas], y[pontas]
+
+    indices = np.empty(n, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = total - 1
+
+    # n-2 baldes entre o primeiro e o último ponto
+    limites = np.linspace(1, total - 1, n - 1).astype(np.int64)
+    a = 0
+
+    for i in range(n - 2):
+        inicio, fim = limites[i], limites[i + 1]
+
+        # média do próximo balde (ou o último ponto)
+        if i + 2 < len(limites):
+            prox_inicio, prox_fim = limites[i + 1], limites[i + 2]
+        else:
+            prox_inicio, prox_fim = total - 1, total
+        xc = x[prox_inicio:prox_fim].mean()
+        yc = y[prox_inicio:prox_fim].mean()
+
+        xb = x[inicio:fim]
+        yb = y[inicio:fim]
+        areas = np.abs((x[a] - xc) * (yb - y[a]) - (x[a] - xb) * (yc - y[a]))
+
+        a = inicio + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return x[indices], y[indices]
+
+
+def minmax(x: np.ndarray, y: np.ndarray, n: int) -> tuple:
+    """
+    Mantém o mínimo e o máximo de cada balde (n/2 baldes), na ordem do tempo.
+    Preserva picos, útil para precipitação e radiação.
+    """
+    total = len(x)
+    baldes = n // 2
+    if n >= total or baldes < 1:
+        return x, y
+
+    limites = np.linspace(0, total, baldes + 1).astype(np.int64)
+    indices = []
+    for inicio, fim in zip(limites[:-1], limites[1:]):
+        trecho = y[inicio:fim]
+        i_min = inicio + int(np.argmin(trecho))
+        i_max = inicio + int(np.argmax(trecho))
+        indices.extend(sorted({i_min, i_max}))
+
+    indices = np.asarray(indices, dtype=np.int64)
+    return x[indices], y[indices]
+
+
+def reduzir(x: np.ndarray, y: np.ndarray, largura: int, metodo: str) -> tuple:
+    """Remove pontos nulos e reduz a série para `largura` pontos."""
+    validos = ~np.isnan(y)
+    x, y = x[validos], y[validos]
+    if metodo == "minmax":
+        return minmax(x, y, largura)
+    return lttb(x, y, largura)
+
+
+# ============================
+# CACHE
+# ============================
+
+class CacheLRU:
+    """LRU com expiração, seguro para os endpoints síncronos (threadpool)."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            criado_em, valor = item
+            if time.monotonic() - criado_em > self.ttl:
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave, valor):
+        with self._lock:
+            self._itens[chave] = (time.monotonic(), valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.maxsize:
+                self._itens.popitem(last=False)
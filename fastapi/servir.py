@@ -0,0 +1,116 @@
+"""
+Launcher de produção da API com N workers.
+
+Todos os workers atendem a porta pública (socket compartilhado) e cada um
+também escuta numa porta interna própria, usada para receber requisições
+encaminhadas pelos outros (ver sharding.py). O processo pai define
+INGEST_NODES/INGEST_SELF de cada worker e reinicia, na mesma porta interna,
+qualquer worker que morrer (os devices dele não ficam sem dono).
+
+    python servir.py --workers 4 --port 8000 --porta-interna 8101
+
+Em vários nós, passe os workers dos outros nós em --nos-externos e use em
+--host-interno um endereço que eles alcancem:
+
+    python servir.py --workers 4 --host-interno no-a --nos-externos no-b:8101,no-b:8102
+"""
+
+import argparse
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+INTERVALO_REINICIO_S = 1
+
+
+def _abrir_socket(host: str, porta: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, porta))
+    sock.set_inheritable(True)
+    return sock
+
+
+def _rodar_worker(publico: socket.socket, porta_interna: int, args, ambiente: dict):
+    os.environ.update(ambiente)
+    interno = _abrir_socket(args.bind_interno, porta_interna)
+
+    config = uvicorn.Config(
+        "main:app",
+        log_level=args.log_level,
+        timeout_keep_alive=30,
+    )
+    uvicorn.Server(config).run(sockets=[publico, interno])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sobe a API com vários workers.")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--porta-interna", type=int, default=8101)
+    parser.add_argument("--bind-interno", default="127.0.0.1",
+                        help="Interface das portas internas (0.0.0.0 com --nos-externos)")
+    parser.add_argument("--host-interno", default="127.0.0.1",
+                        help="Endereço pelo qual os outros workers alcançam este nó")
+    parser.add_argument("--nos-externos", default="",
+                        help="host:porta dos workers de outros nós, separados por vírgula")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    publico = _abrir_socket(args.host, args.port)
+
+    locais = [f"{args.host_interno}:{args.porta_interna + i}" for i in range(args.workers)]
+    externos = [n.strip() for n in args.nos_externos.split(",") if n.strip()]
+    nos = ",".join(locais + externos)
+
+    print(f"🚀 {args.workers} workers em {args.host}:{args.port} | nós: {nos}")
+
+    def iniciar(i: int) -> multiprocessing.Process:
+        ambiente = {"INGEST_NODES": nos, "INGEST_SELF": locais[i]}
+        processo = multiprocessing.Process(
+            target=_rodar_worker,
+            args=(publico, args.porta_interna + i, args, ambiente),
+            name=f"worker-{i}",
+        )
+        processo.start()
+        return processo
+
+    processos = [iniciar(i) for i in range(len(locais))]
+    encerrando = False
+
+    def encerrar(signum, frame):
+        nonlocal encerrando
+        encerrando = True
+        for processo in processos:
+            processo.terminate()
+
+    signal.signal(signal.SIGTERM, encerrar)
+    signal.signal(signal.SIGINT, encerrar)
+
+    # Supervisor: espera algum worker sair e sobe outro no mesmo lugar
+    while not encerrando:
+        wait([processo.sentinel for processo in processos])
+        if encerrando:
+            break
+        for i, processo in enumerate(processos):
+            if processo.is_alive():
+                continue
+            processo.join()
+            print(f"⚠️  {processo.name} saiu (código {processo.exitcode}); reiniciando")
+            # Evita laço quente se o worker morre logo ao subir
+            time.sleep(INTERVALO_REINICIO_S)
+            if not encerrando:
+                processos[i] = iniciar(i)
+
+    for processo in processos:
+        processo.join()
+
+
+if __name__ == "__main__":
+    main()
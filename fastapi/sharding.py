@@ -0,0 +1,206 @@
+"""
+Posse de devices entre workers/nós da ingestão por hashing consistente.
+
+Cada worker tem um endereço interno (INGEST_SELF) e conhece todos os outros
+(INGEST_NODES). O anel decide, de forma determinística, qual worker é dono
+de cada device; só o dono escreve os CSVs mensais do device no MinIO e mantém
+as estatísticas em tempo real dele. Os outros apenas encaminham a requisição.
+
+Sem INGEST_NODES (ex: `uvicorn main:app`), o processo é dono de tudo.
+
+    INGEST_NODES=127.0.0.1:8101,127.0.0.1:8102,outro-no:8101
+    INGEST_SELF=127.0.0.1:8101
+    INGEST_SEGREDO=...   # opcional, exigido nas requisições encaminhadas
+
+O cabeçalho de encaminhamento só é aceito na porta interna do worker: na
+porta pública ele é ignorado e a requisição é roteada normalmente. Mesmo
+encaminhada, a requisição só é atendida pelo dono do device.
+"""
+
+from bisect import bisect
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+
+logger = logging.getLogger("uvicorn.error")
+
+# Cabeçalho que marca uma requisição já encaminhada (evita laços)
+HEADER_ENCAMINHADO = "X-Ingest-Encaminhado"
+
+TIMEOUT_ENCAMINHAR_S = 10
+
+# Espera entre tentativas de reconectar ao stream SSE de um nó
+INTERVALO_MAX_RECONEXAO_S = 30
+
+
+def _hash(chave: str) -> int:
+    return int.from_bytes(hashlib.md5(chave.encode("utf-8")).digest()[:8], "big")
+
+
+class AnelConsistente:
+    """Anel de hashing consistente com nós virtuais."""
+
+    def __init__(self, nos: list, replicas: int = 64):
+        self.nos = sorted(set(nos))
+        pontos = sorted(
+            (_hash(f"{no}#{i}"), no) for no in self.nos for i in range(replicas)
+        )
+        self._hashes = [h for h, _ in pontos]
+        self._nos = [no for _, no in pontos]
+
+    def dono(self, chave: str) -> str:
+        if not self._nos:
+            return None
+        i = bisect(self._hashes, _hash(chave)) % len(self._hashes)
+        return self._nos[i]
+
+
+class Roteador:
+    """Decide se um device é local e encaminha para o dono quando não é."""
+
+    def __init__(self, nos: list, proprio: str, segredo: str = ""):
+        self.proprio = proprio
+        self.anel = AnelConsistente(nos)
+        self.segredo = segredo
+        self.porta_interna = int(proprio.rpartition(":")[2]) if proprio else None
+        self._sessao = None
+
+    @classmethod
+    def do_ambiente(cls) -> "Roteador":
+        nos = [n.strip() for n in os.getenv("INGEST_NODES", "").split(",") if n.strip()]
+        return cls(nos, os.getenv("INGEST_SELF", ""), os.getenv("INGEST_SEGREDO", ""))
+
+    @property
+    def distribuido(self) -> bool:
+        return len(self.anel.nos) > 1
+
+    def dono(self, device: str) -> str:
+        return self.anel.dono(device) if self.distribuido else self.proprio
+
+    @property
+    def valor_header(self) -> str:
+        return self.segredo or "1"
+
+    def encaminhada(self, request) -> bool:
+        """
+        A requisição veio de outro worker? Só se chegou pela porta interna
+        deste worker (scope["server"]) com o cabeçalho (e o segredo) certo.
+        """
+        if not self.distribuido:
+            return False
+        valor = request.headers.get(HEADER_ENCAMINHADO)
+        if not valor:
+            return False
+        servidor = request.scope.get("server")
+        if not servidor or servidor[1] != self.porta_interna:
+            return False
+        return hmac.compare_digest(valor, self.valor_header)
+
+    def e_local(self, device: str) -> bool:
+        if not self.distribuido:
+            return True
+        return self.dono(device) == self.proprio
+
+    def encaminhar(self, no: str, metodo: str, caminho: str, corpo: bytes = None):
+        """
+        Repassa a requisição ao dono (síncrono: chamar via threadpool).
+        Retorna (status, json).
+        """
+        import requests
+
+        if self._sessao is None:
+            self._sessao = requests.Session()
+
+        resp = self._sessao.request(
+            metodo,
+            f"http://{no}{caminho}",
+            data=corpo,
+            headers={HEADER_ENCAMINHADO: self.valor_header},
+            timeout=TIMEOUT_ENCAMINHAR_S,
+        )
+        return resp.status_code, resp.json()
+
+
+async def _ler_stream_sse(no: str, caminho: str, valor_header: str, fila: asyncio.Queue, conectado):
+    """Lê o stream SSE de um nó até ele terminar; erros sobem para quem chamou."""
+    host, _, porta = no.rpartition(":")
+    reader, writer = await asyncio.open_connection(host, int(porta))
+    try:
+        writer.write(
+            (
+                f"GET {caminho} HTTP/1.1\r\nHost: {no}\r\n"
+                f"Accept: text/event-stream\r\n{HEADER_ENCAMINHADO}: {valor_header}\r\n\r\n"
+            ).encode("ascii")
+        )
+        await writer.drain()
+
+        status = (await reader.readline()).decode("latin-1").split()
+        if len(status) < 2 or status[1] != "200":
+            raise ConnectionError(f"resposta inesperada: {' '.join(status) or 'vazia'}")
+
+        # Cabeçalhos HTTP da resposta
+        chunked = False
+        while (linha := await reader.readline()) not in (b"\r\n", b""):
+            nome, _, valor = linha.decode("latin-1").partition(":")
+            if nome.strip().lower() == "transfer-encoding" and "chunked" in valor.lower():
+                chunked = True
+        if not chunked:
+            raise ConnectionError("resposta sem chunked encoding")
+        conectado()
+
+        # Corpo em chunked encoding; eventos SSE terminam em linha vazia
+        buffer = b""
+        while True:
+            tamanho = int((await reader.readline()).strip() or b"0", 16)
+            if tamanho == 0:
+                break
+            buffer += await reader.readexactly(tamanho)
+            await reader.readline()
+
+            while b"\n\n" in buffer:
+                evento, buffer = buffer.split(b"\n\n", 1)
+                await fila.put(evento.decode("utf-8") + "\n\n")
+    finally:
+        writer.close()
+
+
+async def retransmitir_sse(nos: list, caminho: str, valor_header: str = "1"):
+    """
+    Abre o stream SSE `caminho` em cada nó e repassa as linhas recebidas,
+    intercalando os eventos completos de todos eles.
+
+    Se um nó cair (ou recusar a conexão), o erro é registrado, o cliente
+    recebe um comentário SSE avisando e a conexão é refeita com backoff.
+    """
+    fila = asyncio.Queue(maxsize=1000)
+
+    async def ler(no: str):
+        espera = 1
+
+        def conectado():
+            nonlocal espera
+            espera = 1
+
+        while True:
+            try:
+                await _ler_stream_sse(no, caminho, valor_header, fila, conectado)
+                erro = "stream encerrado"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                erro = f"{type(e).__name__}: {e}"
+
+            logger.warning("SSE: nó %s indisponível (%s); nova tentativa em %ss", no, erro, espera)
+            await fila.put(f": no {no} indisponivel, reconectando\n\n")
+            await asyncio.sleep(espera)
+            espera = min(espera * 2, INTERVALO_MAX_RECONEXAO_S)
+
+    tarefas = [asyncio.create_task(ler(no)) for no in nos]
+    try:
+        while True:
+            yield await fila.get()
+    finally:
+        for tarefa in tarefas:
+            tarefa.cancel()
@@ -0,0 +1,217 @@
+"""
+Estatísticas móveis em tempo real por device e variável, alimentadas pelo
+webhook, e difusão das atualizações para assinantes (Server-Sent Events).
+
+Cada variável tem um buffer circular em arrays NumPy com a janela das
+últimas 24 h (pelo timestamp da leitura). A cada leitura, em O(1)
+amortizado, são mantidos:
+
+- média e soma (a soma é o acumulado de precipitação);
+- variância por Welford (com remoção de quem sai da janela);
+- mínimo e máximo por deques monotônicos.
+
+A janela só anda para frente: leituras com ts anterior à mais recente já
+recebida, mas ainda dentro da janela (reenvios fora de ordem), não entram nas
+estatísticas. Um salto para trás maior que a janela (replay de outro período)
+recomeça a janela a partir da nova leitura. Leituras com ts no futuro (além de
+TOLERANCIA_FUTURO_S) são ignoradas, para não empurrar a janela para frente.
+Em todos os casos a leitura continua sendo gravada no MinIO normalmente.
+"""
+
+from collections import deque
+import asyncio
+import math
+import time
+
+JANELA_PADRAO_S = 24 * 3600
+
+# Leituras horárias cabem com folga; se chegar mais rápido, os mais antigos saem
+CAPACIDADE_PADRAO = 4096
+
+# Folga para relógios adiantados; além disso o ts é considerado inválido
+TOLERANCIA_FUTURO_S = 3600
+
+# Ordem das colunas na linha CSV do webhook (depois de "hora")
+VARIAVEIS = ["temp_ar", "umidade", "radiacao", "vento_vel", "precipitacao", "pressao"]
+
+
+class JanelaMovel:
+    """Buffer circular (ts, valor) com estatísticas incrementais da janela."""
+
+    def __init__(self, janela_s: float = JANELA_PADRAO_S, capacidade: int = CAPACIDADE_PADRAO):
+        # numpy só é importado quando chega a primeira leitura (startup rápido)
+        import numpy as np
+
+        self.janela_s = janela_s
+        self.capacidade = capacidade
+        self._ts = np.zeros(capacidade, dtype=np.float64)
+        self._valores = np.zeros(capacidade, dtype=np.float64)
+        self.limpar()
+
+    def limpar(self):
+        """Esvazia a janela (os buffers são reaproveitados)."""
+        # Índices absolutos: posição no buffer = índice % capacidade
+        self._inicio = 0
+        self._fim = 0
+        self._ts_max = -math.inf
+
+        self._soma = 0.0
+        self._media = 0.0
+        self._m2 = 0.0
+
+        # Índices absolutos com valores crescentes (min) / decrescentes (max)
+        self._deque_min = deque()
+        self._deque_max = deque()
+
+    def __len__(self) -> int:
+        return self._fim - self._inicio
+
+    def _remover_mais_antigo(self):
+        i = self._inicio
+        valor = float(self._valores[i % self.capacidade])
+        self._inicio += 1
+
+        self._soma -= valor
+        n = len(self)
+        if n == 0:
+            self._soma = self._media = self._m2 = 0.0
+        else:
+            delta = valor - self._media
+            self._media -= delta / n
+            self._m2 = max(self._m2 - delta * (valor - self._media), 0.0)
+
+        if self._deque_min and self._deque_min[0] == i:
+            self._deque_min.popleft()
+        if self._deque_max and self._deque_max[0] == i:
+            self._deque_max.popleft()
+
+    def adicionar(self, ts: float, valor: float) -> bool:
+        """
+        Inclui uma leitura (ts em segundos). Leituras fora de ordem (ts menor
+        que o da mais recente) são ignoradas: o buffer fica ordenado por ts e
+        a expiração pela cabeça continua correta. Se o ts voltar mais que a
+        janela inteira, a janela recomeça por esta leitura.
+        """
+        if ts <= self._ts_max - self.janela_s:
+            self.limpar()
+        elif ts < self._ts_max:
+            return False
+
+        if len(self) == self.capacidade:
+            self._remover_mais_antigo()
+
+        i = self._fim
+        self._ts[i % self.capacidade] = ts
+        self._valores[i % self.capacidade] = valor
+        self._fim += 1
+
+        self._soma += valor
+        delta = valor - self._media
+        self._media += delta / len(self)
+        self._m2 += delta * (valor - self._media)
+
+        while self._deque_min and self._valores[self._deque_min[-1] % self.capacidade] >= valor:
+            self._deque_min.pop()
+        self._deque_min.append(i)
+        while self._deque_max and self._valores[self._deque_max[-1] % self.capacidade] <= valor:
+            self._deque_max.pop()
+        self._deque_max.append(i)
+
+        # Tira da frente o que saiu da janela
+        self._ts_max = ts
+        limite = self._ts_max - self.janela_s
+        while self._ts[self._inicio % self.capacidade] <= limite:
+            self._remover_mais_antigo()
+        return True
+
+    def resumo(self) -> dict:
+        n = len(self)
+        if n == 0:
+            return {"n": 0}
+        return {
+            "n": n,
+            "media": self._media,
+            "min": float(self._valores[self._deque_min[0] % self.capacidade]),
+            "max": float(self._valores[self._deque_max[0] % self.capacidade]),
+            "soma": self._soma,
+            "variancia": self._m2 / (n - 1) if n > 1 else 0.0,
+            "desvio": math.sqrt(self._m2 / (n - 1)) if n > 1 else 0.0,
+            "ultimo": float(self._valores[(self._fim - 1) % self.capacidade]),
+        }
+
+
+class EstatisticasTempoReal:
+    """Janelas móveis por device e variável."""
+
+    def __init__(self, janela_s: float = JANELA_PADRAO_S, capacidade: int = CAPACIDADE_PADRAO):
+        self.janela_s = janela_s
+        self.capacidade = capacidade
+        self._janelas = {}
+
+    def atualizar(self, device: str, ts: float, valores: dict) -> dict:
+        """
+        Inclui as leituras (ts em epoch s) e retorna o resumo do device, ou
+        None se o ts está no futuro e a leitura foi ignorada.
+        """
+        if ts > time.time() + TOLERANCIA_FUTURO_S:
+            return None
+
+        janelas = self._janelas.setdefault(device, {})
+        for variavel, valor in valores.items():
+            janela = janelas.get(variavel)
+            if janela is None:
+                janela = janelas[variavel] = JanelaMovel(self.janela_s, self.capacidade)
+            janela.adicionar(ts, valor)
+        return self.resumo(device)
+
+    def resumo(self, device: str) -> dict:
+        janelas = self._janelas.get(device)
+        if janelas is None:
+            return None
+        return {variavel: janela.resumo() for variavel, janela in janelas.items()}
+
+    def devices(self) -> list:
+        return sorted(self._janelas)
+
+
+class Difusor:
+    """
+    Fan-out em asyncio: cada assinante tem sua própria fila limitada.
+    Assinante lento perde os eventos mais antigos, não trava os demais.
+    """
+
+    def __init__(self, tamanho_fila: int = 100):
+        self.tamanho_fila = tamanho_fila
+        self._assinantes = set()
+
+    def assinar(self) -> asyncio.Queue:
+        fila = asyncio.Queue(maxsize=self.tamanho_fila)
+        self._assinantes.add(fila)
+        return fila
+
+    def cancelar(self, fila: asyncio.Queue):
+        self._assinantes.discard(fila)
+
+    def publicar(self, evento: dict):
+        for fila in self._assinantes:
+            if fila.full():
+                fila.get_nowait()
+            fila.put_nowait(evento)
+
+    @property
+    def total_assinantes(self) -> int:
+        return len(self._assinantes)
+
+
+def parse_valores(partes: list) -> dict:
+    """Converte as colunas da linha CSV (sem a hora) em {variavel: float}."""
+    valores = {}
+    for variavel, bruto in zip(VARIAVEIS, partes):
+        try:
+            valor = float(bruto)
+        except ValueError:
+            continue
+        # inf/nan quebrariam as estatísticas e o JSON das respostas
+        if math.isfinite(valor):
+            valores[variavel] = valor
+    return valores
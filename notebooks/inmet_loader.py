@@ -0,0 +1,156 @@
+"""
+Leitura econômica da tabela inmet_raw para os notebooks.
+
+Em vez de `pd.read_sql("SELECT * FROM inmet_raw", engine)` (tudo em
+float64/object, incluindo o `id` que ninguém usa), aqui:
+
+- só as colunas pedidas são selecionadas;
+- o resultado vem em blocos por um cursor do lado do servidor;
+- `device_name` vira categórica e as medidas viram float32;
+- opcionalmente as colunas são Arrow (`arrow=True`).
+
+Uso:
+    from inmet_loader import carregar_inmet_raw
+    df = carregar_inmet_raw(engine, devices=["INMET_Petrolina"], inicio="2020-01-01")
+"""
+
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+TABELA = "inmet_raw"
+
+COLUNAS_MEDIDAS = [
+    "temp_ar",
+    "umidade",
+    "radiacao",
+    "vento_vel",
+    "precipitacao",
+    "pressao",
+]
+COLUNAS_PADRAO = ["device_name", "ts"] + COLUNAS_MEDIDAS
+
+CHUNKSIZE_PADRAO = 100_000
+
+
+# ============================
+# CONSULTA
+# ============================
+
+def _montar_consulta(colunas, devices, inicio, fim):
+    invalidas = set(colunas) - set(COLUNAS_PADRAO)
+    if invalidas:
+        raise ValueError(f"Colunas desconhecidas em {TABELA}: {sorted(invalidas)}")
+
+    filtros, params = [], {}
+    if devices:
+        filtros.append("device_name IN :devices")
+        params["devices"] = list(devices)
+    if inicio is not None:
+        filtros.append("ts >= :inicio")
+        params["inicio"] = pd.Timestamp(inicio).to_pydatetime()
+    if fim is not None:
+        filtros.append("ts < :fim")
+        params["fim"] = pd.Timestamp(fim).to_pydatetime()
+
+    sql = f"SELECT {', '.join(colunas)} FROM {TABELA}"
+    if filtros:
+        sql += " WHERE " + " AND ".join(filtros)
+
+    consulta = text(sql)
+    if devices:
+        consulta = consulta.bindparams(bindparam("devices", expanding=True))
+    return consulta, params
+
+
+def _categorias_devices(conn, devices) -> pd.CategoricalDtype:
+    """
+    Categorias fixas para todos os blocos; assim o concat final continua
+    categórico em vez de voltar para object.
+    """
+    if devices:
+        nomes = sorted(set(devices))
+    else:
+        nomes = [
+            linha[0]
+            for linha in conn.execute(
+                text(f"SELECT DISTINCT device_name FROM {TABELA} ORDER BY 1")
+            )
+        ]
+    return pd.CategoricalDtype(nomes)
+
+
+def _compactar(df: pd.DataFrame, categorias, arrow: bool) -> pd.DataFrame:
+    medidas = [c for c in COLUNAS_MEDIDAS if c in df.columns]
+
+    if arrow:
+        import pyarrow as pa
+
+        tipos = {c: pd.ArrowDtype(pa.float32()) for c in medidas}
+        if "device_name" in df.columns:
+            tipos["device_name"] = pd.ArrowDtype(pa.dictionary(pa.int32(), pa.string()))
+        if "ts" in df.columns:
+            tipos["ts"] = pd.ArrowDtype(pa.timestamp("us"))
+        return df.astype(tipos)
+
+    tipos = {c: np.float32 for c in medidas}
+    if "device_name" in df.columns:
+        tipos["device_name"] = categorias
+    return df.astype(tipos)
+
+
+# ============================
+# API PÚBLICA
+# ============================
+
+def iter_inmet_raw(
+    engine,
+    colunas: Optional[Sequence[str]] = None,
+    devices: Optional[Sequence[str]] = None,
+    inicio=None,
+    fim=None,
+    chunksize: int = CHUNKSIZE_PADRAO,
+    arrow: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Gera DataFrames compactos de até `chunksize` linhas.
+    A conexão fica aberta (cursor no servidor) enquanto o gerador é consumido.
+    """
+    colunas = list(colunas or COLUNAS_PADRAO)
+    consulta, params = _montar_consulta(colunas, devices, inicio, fim)
+
+    with engine.connect() as conn:
+        categorias = _categorias_devices(conn, devices) if "device_name" in colunas else None
+        conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+
+        for bloco in pd.read_sql(
+            consulta,
+            conn,
+            params=params,
+            chunksize=chunksize,
+            parse_dates=["ts"] if "ts" in colunas else None,
+        ):
+            yield _compactar(bloco, categorias, arrow)
+
+
+def carregar_inmet_raw(
+    engine,
+    colunas: Optional[Sequence[str]] = None,
+    devices: Optional[Sequence[str]] = None,
+    inicio=None,
+    fim=None,
+    chunksize: int = CHUNKSIZE_PADRAO,
+    arrow: bool = False,
+) -> pd.DataFrame:
+    """Carrega inmet_raw inteira (ou filtrada) em um único DataFrame compacto."""
+    blocos = list(
+        iter_inmet_raw(engine, colunas, devices, inicio, fim, chunksize, arrow)
+    )
+    if not blocos:
+        colunas = list(colunas or COLUNAS_PADRAO)
+        return _compactar(
+            pd.DataFrame(columns=colunas), pd.CategoricalDtype(list(devices or [])), arrow
+        )
+    return pd.concat(blocos, ignore_index=True)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Verificação do tempo de startup da API
+
+Sobe a aplicação num interpretador novo com o MinIO inalcançável e confere:
+- `import main` (já com o fastapi importado) dentro do orçamento;
+- startup do lifespan dentro do orçamento, sem esperar o MinIO;
+- /health responde 200 e /ready responde 503 (modo degradado);
+- numpy, minio, sqlalchemy e requests não foram importados no startup.
+
+Uso:
+    python scripts/check_startup.py
+    python scripts/check_startup.py --orcamento-import-ms 300
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+FASTAPI_DIR = Path(__file__).resolve().parent.parent / "fastapi"
+
+PESADOS = ["numpy", "minio", "sqlalchemy", "requests", "pandas", "sklearn"]
+
+# Executado no interpretador novo, a partir de fastapi/
+MEDICAO = """
+import asyncio, json, sys, time
+
+import fastapi  # custo do framework fica fora da medição
+
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter() - t0
+
+async def subir():
+    t0 = time.perf_counter()
+    async with main.app.router.lifespan_context(main.app):
+        t_startup = time.perf_counter() - t0
+        # Antes do /ready, que importa o sqlalchemy para testar o PostgreSQL
+        importados = [m for m in PESADOS if m in sys.modules]
+        health = main.health_check()
+        ready = main.readiness_check()
+    return t_startup, health, ready, importados
+
+t_startup, health, ready, importados = asyncio.run(subir())
+print(json.dumps({
+    "import_ms": t_import * 1000,
+    "startup_ms": t_startup * 1000,
+    "health": health["status"],
+    "ready_status": ready.status_code,
+    "importados": importados,
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o startup da API.")
+    parser.add_argument("--orcamento-import-ms", type=float, default=200)
+    parser.add_argument("--orcamento-startup-ms", type=float, default=100)
+    parser.add_argument("--minio-endpoint", default="127.0.0.1:1",
+                        help="Endpoint inalcançável (modo degradado)")
+    args = parser.parse_args()
+
+    ambiente = dict(os.environ, MINIO_ENDPOINT=args.minio_endpoint)
+    ambiente.pop("INGEST_NODES", None)
+
+    resultado = subprocess.run(
+        [sys.executable, "-c", f"PESADOS = {PESADOS!r}\n{MEDICAO}"],
+        cwd=FASTAPI_DIR,
+        env=ambiente,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    if resultado.returncode != 0:
+        print(resultado.stderr)
+        print("❌ FALHOU: a API não subiu")
+        sys.exit(1)
+
+    medida = json.loads(resultado.stdout.strip().splitlines()[-1])
+    print(f"⏱️  import main: {medida['import_ms']:.0f} ms (orçamento {args.orcamento_import_ms:.0f} ms)")
+    print(f"⏱️  startup:     {medida['startup_ms']:.0f} ms (orçamento {args.orcamento_startup_ms:.0f} ms)")
+    print(f"ℹ️  /health: {medida['health']} | /ready: HTTP {medida['ready_status']}")
+
+    falhas = []
+    if medida["import_ms"] > args.orcamento_import_ms:
+        falhas.append("import acima do orçamento")
+    if medida["startup_ms"] > args.orcamento_startup_ms:
+        falhas.append("startup acima do orçamento")
+    if medida["health"] != "ok":
+        falhas.append("/health não respondeu ok")
+    if medida["ready_status"] != 503:
+        falhas.append("/ready deveria estar degradado sem MinIO")
+    if medida["importados"]:
+        falhas.append(f"módulos pesados no startup: {', '.join(medida['importados'])}")
+
+    if falhas:
+        print(f"❌ FALHOU: {'; '.join(falhas)}")
+        sys.exit(1)
+
+    print("✅ Startup rápido e em modo degradado sem MinIO")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
+import gzip
 import io
 import pandas as pd
 from minio import Minio
 from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import insert
 
 # ===============================
 # CONFIGURAÇÃO DO MINIO
@@ -37,10 +39,39 @@ CREATE TABLE IF NOT EXISTS inmet_raw (
 );
 """
 
+# Uma leitura por (device, ts): reenvios e reprocessamentos não duplicam linhas.
+# É também o índice usado pelo score_weekly_clusters.py e pelas consultas por faixa.
+UNIQUE_INDEX = "inmet_raw_device_ts_uidx"
+
+# Índice não único nas mesmas colunas, criado por versões antigas do
+# score_weekly_clusters.py: o único o substitui
+OLD_INDEX = "inmet_raw_device_ts_idx"
+
+# Tabelas criadas antes do índice podem ter duplicatas: fica a de menor id
+REMOVE_DUPLICATAS = """
+DELETE FROM inmet_raw a
+USING inmet_raw b
+WHERE a.device_name = b.device_name
+  AND a.ts = b.ts
+  AND a.id > b.id;
+"""
+
 with engine.begin() as conn:
     conn.execute(text(CREATE_TABLE))
     print("📌 Tabela inmet_raw verificada/criada.")
 
+    existe = conn.execute(
+        text("SELECT 1 FROM pg_indexes WHERE indexname = :nome"), {"nome": UNIQUE_INDEX}
+    ).first()
+    if not existe:
+        removidas = conn.execute(text(REMOVE_DUPLICATAS)).rowcount
+        conn.execute(
+            text(f"CREATE UNIQUE INDEX {UNIQUE_INDEX} ON inmet_raw (device_name, ts)")
+        )
+        print(f"📌 Índice único (device_name, ts) criado ({removidas} duplicatas removidas).")
+
+    conn.execute(text(f"DROP INDEX IF EXISTS {OLD_INDEX}"))
+
 
 # ===============================
 # FUNÇÕES AUXILIARES
@@ -48,7 +79,7 @@ with engine.begin() as conn:
 
 def load_csv_from_minio(obj_name: str) -> pd.DataFrame:
     """
-    Baixa um CSV do MinIO e carrega em um DataFrame.
+    Baixa um CSV (.csv ou .csv.gz) do MinIO e carrega em um DataFrame.
     Os CSVs foram gerados pela FastAPI com header:
     hora,temp_ar,umidade,radiacao,vento_vel,precipitacao,pressao
     """
@@ -57,6 +88,10 @@ def load_csv_from_minio(obj_name: str) -> pd.DataFrame:
     response.close()
     response.release_conn()
 
+    # O urllib3 pode já ter descomprimido (Content-Encoding: gzip)
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+
     df = pd.read_csv(
         io.BytesIO(data),
         sep=",",
@@ -68,9 +103,19 @@ def load_csv_from_minio(obj_name: str) -> pd.DataFrame:
     return df
 
 
+def insert_ignorando_duplicatas(table, conn, keys, data_iter):
+    """Método do to_sql: INSERT ... ON CONFLICT (device_name, ts) DO NOTHING."""
+    rows = [dict(zip(keys, row)) for row in data_iter]
+    stmt = insert(table.table).values(rows).on_conflict_do_nothing(
+        index_elements=["device_name", "ts"]
+    )
+    return conn.execute(stmt).rowcount
+
+
 def insert_into_postgres(df: pd.DataFrame, device_name: str):
     """
     Normaliza o DataFrame e insere na tabela inmet_raw.
+    Leituras (device_name, ts) já existentes são ignoradas.
     """
     # coluna 'hora' é o timestamp ISO gerado lá no ThingsBoard
     if "hora" not in df.columns:
@@ -98,15 +143,20 @@ def insert_into_postgres(df: pd.DataFrame, device_name: str):
     ]
     df = df[cols]
 
+    # Reenvios do mesmo ts dentro do arquivo: fica a primeira leitura
+    df = df.drop_duplicates(subset=["device_name", "ts"], keep="first")
+
     # Insere no Postgres
-    df.to_sql(
+    inseridos = df.to_sql(
         "inmet_raw",
         engine,
         if_exists="append",
-        index=False
+        index=False,
+        method=insert_ignorando_duplicatas,
+        chunksize=5000,
     )
 
-    print(f"✔ Inserido {len(df)} registros de {device_name}")
+    print(f"✔ Inserido {inseridos} registros de {device_name} ({len(df) - inseridos} já existiam)")
 
 
 # ===============================
@@ -120,7 +170,7 @@ def main():
     objetos = minio_client.list_objects(BUCKET, recursive=True)
 
     for obj in objetos:
-        if not obj.object_name.endswith(".csv"):
+        if not obj.object_name.endswith((".csv", ".csv.gz")):
             continue
 
         print(f"\n📥 Lendo arquivo: {obj.object_name}")
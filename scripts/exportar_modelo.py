@@ -0,0 +1,263 @@
+"""
+Exporta os modelos treinados em 02_modelagem para o formato compacto
+lido por fastapi/modelo.py (manifest JSON + arrays .npz).
+
+Uso no notebook (com scaler, kmeans e clf/modelo_reg em memória):
+
+    from exportar_modelo import exportar_modelo
+    exportar_modelo(
+        "../data/modelo",
+        scaler, kmeans, variaveis_modelo,
+        modelos={"decision_tree_classifier": clf, "random_forest_regressor": modelo_reg},
+        X_teste=df_gar_sem[variaveis_modelo],
+        limites_outliers=limites_iqr_por_cidade(df, variaveis_climaticas),
+    )
+
+Uso no host (a partir de pickles):
+
+    python scripts/exportar_modelo.py --scaler scaler.pkl --kmeans kmeans.pkl \
+        --modelo decision_tree_classifier=notebooks/decision_tree_classifier.pkl
+"""
+
+import argparse
+import copy
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# O avaliador fica junto da API (é o que vai para o container)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fastapi"))
+
+from modelo import (  # noqa: E402
+    ARRAYS_NAME,
+    FOLHA,
+    FORMATO,
+    MANIFEST_NAME,
+    VERSAO_FORMATO,
+    ModeloClima,
+)
+
+DESTINO_PADRAO = Path("./data/modelo")
+
+
+# ===============================
+# SERIALIZAÇÃO DAS ÁRVORES
+# ===============================
+
+def _arvores(estimador) -> list:
+    """Retorna a lista de árvores (tree_) de uma árvore ou floresta."""
+    if hasattr(estimador, "estimators_"):
+        return [arvore.tree_ for arvore in estimador.estimators_]
+    return [estimador.tree_]
+
+
+def serializar_ensemble(nome: str, estimador, variaveis: list) -> tuple:
+    """
+    Concatena os nós de todas as árvores em arrays planos.
+    Retorna (metadados para o manifest, dict de arrays para o npz).
+    """
+    feature, threshold, left, right, value, raizes = [], [], [], [], [], []
+    deslocamento = 0
+
+    for tree in _arvores(estimador):
+        filhos_esq = tree.children_left.astype(np.int32)
+        filhos_dir = tree.children_right.astype(np.int32)
+        folha = filhos_esq == FOLHA
+
+        raizes.append(deslocamento)
+        feature.append(np.where(folha, 0, tree.feature).astype(np.int32))
+        threshold.append(tree.threshold.astype(np.float64))
+        left.append(np.where(folha, FOLHA, filhos_esq + deslocamento).astype(np.int32))
+        right.append(np.where(folha, FOLHA, filhos_dir + deslocamento).astype(np.int32))
+        # Uma saída só: (n_nos, n_classes) ou (n_nos, 1) na regressão
+        value.append(tree.value[:, 0, :].astype(np.float64))
+
+        deslocamento += tree.node_count
+
+    classificador = hasattr(estimador, "classes_")
+    meta = {
+        "tipo": "classifier" if classificador else "regressor",
+        "estimador": type(estimador).__name__,
+        "variaveis": list(variaveis),
+        "n_arvores": len(raizes),
+        "n_nos": deslocamento,
+        "classes": estimador.classes_.tolist() if classificador else None,
+    }
+    arrays = {
+        f"{nome}/raizes": np.asarray(raizes, dtype=np.int32),
+        f"{nome}/feature": np.concatenate(feature),
+        f"{nome}/threshold": np.concatenate(threshold),
+        f"{nome}/left": np.concatenate(left),
+        f"{nome}/right": np.concatenate(right),
+        f"{nome}/value": np.concatenate(value),
+    }
+    return meta, arrays
+
+
+def _variaveis_do_estimador(estimador, padrao: list) -> list:
+    nomes = getattr(estimador, "feature_names_in_", None)
+    return list(nomes) if nomes is not None else list(padrao)
+
+
+# ===============================
+# FILTRO DE OUTLIERS DO TREINO
+# ===============================
+
+def limites_iqr_por_cidade(df, colunas, factor=1.5) -> dict:
+    """
+    Limites [inferior, superior] por device e coluna, na mesma sequência de
+    remover_outliers_iqr_por_cidade() do 02_modelagem (cada coluna é medida
+    depois do filtro das anteriores). Aplicar todos os limites de uma vez
+    seleciona exatamente as mesmas linhas.
+    """
+    limites = {}
+    for device, grupo in df.groupby("device_name", observed=True):
+        atual = grupo
+        limites_device = {}
+        for col in colunas:
+            q1 = atual[col].quantile(0.25)
+            q3 = atual[col].quantile(0.75)
+            iqr = q3 - q1
+            inferior = q1 - factor * iqr
+            superior = q3 + factor * iqr
+            atual = atual[(atual[col] >= inferior) & (atual[col] <= superior)]
+            limites_device[col] = [float(inferior), float(superior)]
+        limites[str(device)] = limites_device
+    return limites
+
+
+# ===============================
+# EXPORTAÇÃO
+# ===============================
+
+def exportar_modelo(
+    destino, scaler, kmeans, variaveis, modelos=None, X_teste=None, limites_outliers=None
+) -> Path:
+    """
+    Grava manifest.json + arrays.npz em `destino`.
+
+    `modelos` é um dict nome -> DecisionTree*/RandomForest* já treinado.
+    Se `X_teste` (DataFrame com as colunas de `variaveis`) for passado, o
+    artefato é recarregado e as previsões são comparadas com o sklearn.
+    `limites_outliers` (ver limites_iqr_por_cidade) vai no manifest para o
+    scoring semanal filtrar as leituras como no treino.
+    """
+    import sklearn
+
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+
+    arrays = {
+        "scaler/mean": np.asarray(scaler.mean_, dtype=np.float64),
+        "scaler/scale": np.asarray(scaler.scale_, dtype=np.float64),
+        "kmeans/centros": np.asarray(kmeans.cluster_centers_, dtype=np.float64),
+    }
+    manifest = {
+        "formato": FORMATO,
+        "versao_formato": VERSAO_FORMATO,
+        "sklearn_version": sklearn.__version__,
+        "numpy_version": np.__version__,
+        "criado_em": datetime.utcnow().isoformat(),
+        "variaveis": list(variaveis),
+        "k_clusters": int(kmeans.n_clusters),
+        "limites_outliers": limites_outliers or {},
+        "modelos": {},
+    }
+
+    for nome, estimador in (modelos or {}).items():
+        meta, arrays_modelo = serializar_ensemble(
+            nome, estimador, _variaveis_do_estimador(estimador, variaveis)
+        )
+        manifest["modelos"][nome] = meta
+        arrays.update(arrays_modelo)
+
+    np.savez_compressed(destino / ARRAYS_NAME, **arrays)
+    (destino / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+
+    print(f"✔ Modelo compacto salvo em {destino}")
+
+    if X_teste is not None:
+        verificar_equivalencia(destino, scaler, kmeans, modelos or {}, X_teste)
+
+    return destino
+
+
+def sequencial(estimador):
+    """
+    Cópia do estimador já treinado com n_jobs=None. Com threads, a floresta
+    soma as árvores em ordem não determinística e o último bit da média
+    varia; o compacto soma em ordem fixa. `clone` não serve: descarta o ajuste.
+    """
+    estimador = copy.deepcopy(estimador)
+    paralelos = {p: None for p in estimador.get_params() if p.split("__")[-1] == "n_jobs"}
+    if paralelos:
+        estimador.set_params(**paralelos)
+    return estimador
+
+
+def verificar_equivalencia(destino, scaler, kmeans, modelos, X_teste):
+    """
+    Recarrega o artefato e exige previsões idênticas às do sklearn.
+    `X_teste` deve ter todas as colunas usadas pelo scaler e pelos modelos.
+    """
+    compacto = ModeloClima.carregar(destino)
+
+    esperado = kmeans.predict(scaler.transform(X_teste[compacto.variaveis]))
+    obtido = compacto.predict_cluster(
+        compacto.matriz(X_teste[compacto.variaveis].to_numpy())
+    )
+    if not np.array_equal(esperado, obtido):
+        raise AssertionError("K-means compacto diverge do sklearn.")
+
+    for nome, estimador in modelos.items():
+        variaveis = compacto.modelos[nome].variaveis
+        X = X_teste[variaveis]
+
+        esperado = sequencial(estimador).predict(X)
+        obtido = compacto.predict(nome, compacto.matriz(X.to_numpy(), variaveis))
+        if not np.array_equal(esperado, obtido):
+            raise AssertionError(f"Modelo '{nome}' compacto diverge do sklearn.")
+
+    print(f"✔ Previsões idênticas ao sklearn em {len(X_teste)} amostras")
+
+
+# ===============================
+# MAIN
+# ===============================
+
+def main():
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Exporta modelos para o formato compacto.")
+    parser.add_argument("--scaler", required=True, help="Pickle do StandardScaler")
+    parser.add_argument("--kmeans", required=True, help="Pickle do KMeans")
+    parser.add_argument(
+        "--modelo",
+        action="append",
+        default=[],
+        help="nome=caminho.pkl (pode repetir)",
+    )
+    parser.add_argument("--destino", default=str(DESTINO_PADRAO))
+    args = parser.parse_args()
+
+    scaler = joblib.load(args.scaler)
+    kmeans = joblib.load(args.kmeans)
+    variaveis = _variaveis_do_estimador(scaler, [])
+    if not variaveis:
+        parser.error("O scaler precisa ter sido treinado com DataFrame (feature_names_in_).")
+
+    modelos = {}
+    for item in args.modelo:
+        nome, _, caminho = item.partition("=")
+        modelos[nome] = joblib.load(caminho)
+
+    exportar_modelo(args.destino, scaler, kmeans, variaveis, modelos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Teste de carga da ingestão - nenhuma linha pode se perder
+
+Dispara muitas requisições concorrentes no webhook para os mesmos devices
+(cada uma com um timestamp único), depois baixa os CSVs mensais do MinIO
+pela própria API e confere que todas as linhas estão lá. Com --reenvios,
+cada leitura é enviada mais vezes (como nos reenvios do ThingsBoard) e
+nenhuma cópia pode ser gravada.
+
+Uso (com a API rodando via fastapi/servir.py --workers N):
+    python scripts/stress_ingest.py --requisicoes 2000 --clientes 32
+    python scripts/stress_ingest.py --devices 8   # mede a escala entre devices
+    python scripts/stress_ingest.py --reenvios 1  # cada leitura chega duas vezes
+"""
+
+import argparse
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+FASTAPI_URL = "http://localhost:8000"
+
+# Mês fixo e distante dos dados reais; cada execução usa devices novos
+INICIO = datetime(2000, 1, 1)
+
+
+def enviar(sessao: requests.Session, device: str, i: int) -> tuple:
+    ts = INICIO + timedelta(seconds=i)
+    linha = f"{ts.isoformat()}Z,25.0,60,{i},2.0,0,1000.0"
+    resp = sessao.post(f"{FASTAPI_URL}/webhook/inmet/{device}", data=linha, timeout=60)
+    corpo = resp.json()
+    return resp.status_code, corpo.get("worker"), corpo.get("status")
+
+
+def contar_linhas(device: str) -> list:
+    """Baixa os CSVs do device e retorna os timestamps gravados."""
+    resp = requests.get(
+        f"{FASTAPI_URL}/minio/files", params={"prefix": f"inmet/{device}/"}, timeout=30
+    )
+    resp.raise_for_status()
+
+    timestamps = []
+    for arquivo in resp.json()["arquivos"]:
+        conteudo = requests.get(
+            f"{FASTAPI_URL}/minio/download/{arquivo['name']}", timeout=30
+        ).json()["content"]
+        linhas = conteudo.strip().splitlines()[1:]
+        timestamps.extend(linha.split(",")[0] for linha in linhas)
+    return timestamps
+
+
+def main():
+    global FASTAPI_URL
+
+    parser = argparse.ArgumentParser(description="Teste de carga do webhook.")
+    parser.add_argument("--url", default=FASTAPI_URL)
+    parser.add_argument("--requisicoes", type=int, default=1000, help="Por device")
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--reenvios", type=int, default=0,
+                        help="Cópias extras de cada leitura")
+    args = parser.parse_args()
+    FASTAPI_URL = args.url.rstrip("/")
+
+    execucao = uuid.uuid4().hex[:8]
+    devices = [f"STRESS_{execucao}_{d}" for d in range(args.devices)]
+    tarefas = [
+        (device, i)
+        for i in range(args.requisicoes)
+        for device in devices
+        for _ in range(1 + args.reenvios)
+    ]
+
+    print(f"📤 {len(tarefas)} requisições, {args.clientes} clientes, {len(devices)} device(s)")
+
+    sessoes = {}
+
+    def executar(tarefa):
+        sessao = sessoes.setdefault(threading.get_ident(), requests.Session())
+        return enviar(sessao, *tarefa)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clientes) as executor:
+        resultados = list(executor.map(executar, tarefas))
+    duracao = time.perf_counter() - inicio
+
+    erros = sum(1 for status, _, _ in resultados if status != 200)
+    workers = {worker for _, worker, _ in resultados if worker}
+    recusadas = sum(1 for _, _, status in resultados if status == "duplicado")
+    print(f"⏱️  {duracao:.2f}s → {len(tarefas) / duracao:,.0f} req/s | erros HTTP: {erros}")
+    print(f"ℹ️  Workers que gravaram: {len(workers) or 1} | reenvios descartados: {recusadas}")
+
+    perdidas = 0
+    duplicadas = 0
+    for device in devices:
+        gravados = contar_linhas(device)
+        esperados = {
+            f"{(INICIO + timedelta(seconds=i)).isoformat()}Z" for i in range(args.requisicoes)
+        }
+        perdidas += len(esperados - set(gravados))
+        duplicadas += len(gravados) - len(set(gravados))
+
+    esperadas_recusadas = args.requisicoes * len(devices) * args.reenvios
+    if recusadas != esperadas_recusadas:
+        print(f"❌ FALHOU: {recusadas} reenvios descartados, esperado {esperadas_recusadas}")
+        sys.exit(1)
+
+    if erros or perdidas or duplicadas:
+        print(f"❌ FALHOU: {perdidas} linhas perdidas, {duplicadas} duplicadas, {erros} erros")
+        sys.exit(1)
+
+    print(f"✅ Nenhuma linha perdida ou duplicada ({len(tarefas) - recusadas} gravadas)")
+
+
+if __name__ == "__main__":
+    main()